@@ -1,10 +1,14 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, session
 from models.gemini_client import GeminiTravelAssistant
 from models.data_processor import TravelDataProcessor
+from models.user_profile import UserProfile
 from config import Config
 import json
 import os
 import sys
+import threading
+import uuid
+from collections import OrderedDict
 
 # Add current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,10 +16,11 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 try:
-    from flask import Flask, request, jsonify, render_template
+    from flask import Flask, request, jsonify, render_template, session
     from config import Config
     from models.gemini_client import GeminiTravelAssistant
     from models.data_processor import TravelDataProcessor
+    from models.user_profile import UserProfile
     import json
 except ImportError as e:
     print(f"Import error: {e}")
@@ -38,6 +43,25 @@ app.config.from_object(Config)
 gemini_assistant = GeminiTravelAssistant()
 data_processor = TravelDataProcessor()
 
+# Per-session traveler profiles (each with its own Gemini chat), keyed by the id
+# stored in the session cookie.
+# They live in this process only and the least recently used ones are evicted
+# beyond Config.MAX_USER_PROFILES (clients without cookies get a new one per request).
+user_profiles = OrderedDict()
+user_profiles_lock = threading.Lock()
+
+def get_user_profile():
+    """Get (or create) the traveler profile for the current session"""
+    profile_id = session.setdefault('profile_id', uuid.uuid4().hex)
+    with user_profiles_lock:
+        if profile_id in user_profiles:
+            user_profiles.move_to_end(profile_id)
+        else:
+            user_profiles[profile_id] = UserProfile()
+            while len(user_profiles) > Config.MAX_USER_PROFILES:
+                user_profiles.popitem(last=False)
+        return user_profiles[profile_id]
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -61,15 +85,26 @@ def chat():
         
         print(f"🗨️  User ({user_country}): {user_message}")
         
-        # Get relevant data from datasets
-        relevant_data = data_processor.get_relevant_data(user_message)
+        # Accumulate preferences across turns and get relevant data from datasets
+        profile = get_user_profile()
+        profile.user_country = user_country
+        if profile.chat_session is None:
+            profile.chat_session = gemini_assistant.start_chat_session()
+        profile.update(data_processor.extract_preferences(user_message))
+        relevant_data = data_processor.get_relevant_data(user_message, profile)
+        
+        # Only send records the model hasn't seen yet in this session
+        context_data, pending = profile.get_context_delta(relevant_data)
+        context_data['traveler_profile'] = profile.summary()
         
         # Add user context
         if relevant_data:
             relevant_data['user_country'] = user_country
         
         # Get human-like response
-        response = gemini_assistant.get_response(user_message, relevant_data)
+        response = gemini_assistant.get_response(user_message, context_data, relevant_data,
+                                                 on_delivered=lambda: profile.mark_sent(pending),
+                                                 chat_session=profile.chat_session)
         
         print(f"🤖 Emma: {response[:100]}...")
         
@@ -130,7 +165,10 @@ def get_visa_info():
 @app.route('/reset_chat', methods=['POST'])
 def reset_chat():
     try:
-        gemini_assistant.reset_chat()
+        # Dropping the profile drops its Gemini chat too; the next message
+        # starts a fresh profile and chat session
+        with user_profiles_lock:
+            user_profiles.pop(session.pop('profile_id', None), None)
         return jsonify({'message': 'Chat reset successfully'})
     except Exception as e:
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
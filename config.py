@@ -22,6 +22,9 @@ class Config:
     # Data Configuration
     DATA_DIR = 'data'
     
+    # Session Configuration
+    MAX_USER_PROFILES = 1000
+    
     # API Configuration
     API_TIMEOUT = 30
     MAX_TOKENS = 2048
@@ -1,6 +1,57 @@
 import json
 import os
+import re
 from datetime import datetime
+from models.user_profile import UserProfile
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
+}
+
+SEASON_WORDS = {
+    'spring': 'spring', 'summer': 'summer', 'fall': 'fall',
+    'autumn': 'fall', 'winter': 'winter',
+    'dry season': 'dry_season', 'wet season': 'wet_season', 'rainy season': 'wet_season'
+}
+
+CATEGORY_SYNONYMS = {
+    'romance': 'romantic', 'honeymoon': 'romantic',
+    'culture': 'cultural', 'adventurous': 'adventure'
+}
+
+TOPIC_KEYWORDS = {
+    'packages': ['package', 'trip', 'travel', 'traveling', 'travelling', 'vacation', 'holiday'],
+    'weather': ['weather', 'climate', 'temperature', 'rain', 'rainy', 'rainfall'],
+    'visa': ['visa', 'passport', 'entry', 'requirements']
+}
+
+# Amounts followed by one of these are durations or head counts, not prices
+NOT_A_PRICE = (r'(?!\s*(?:days?|weeks?|nights?|months?|years?|hours?|people|persons|'
+               r'adults|kids|children|travell?ers|guests|stars?|of us)\b)')
+# A trailing period ends the sentence unless a digit follows it
+AMOUNT = r'\$?\s*\d[\d,]*(?:\.\d+)?(?!\d|\.\d)k?(?:\s*(?:usd|dollars?))?' + NOT_A_PRICE
+
+# Phrases that drop earlier destination / category filters
+SHOW_EVERYTHING = r'\ball (?:the )?(?:packages|trips|options|destinations)\b'
+ANY_DESTINATION = r'\b(?:anywhere|everywhere|any (?:destination|place|country)s?)\b'
+ANY_CATEGORY = r'\b(?:any (?:kind|type|style|category)|all (?:kinds|types|categories))\b'
+
+# A season word only counts with a cue around it ("in spring", "summer trip"),
+# so "spring rolls" or "fall asleep" don't set a season
+SEASON_BEFORE = r'\b(?:in|during|this|next|last|over|early|late|mid|until)\s+(?:the\s+)?'
+SEASON_AFTER = r'\s+(?:trip|vacation|holiday|break|travel|getaway|weather|months?|season)\b'
+
+
+def contains_word(text, phrase):
+    """Match a word or phrase on word boundaries, allowing a plural 's'"""
+    return re.search(r'\b' + re.escape(phrase) + r's?\b', text) is not None
+
+
+def is_money(amount):
+    """Whether an amount carries a currency marker or a 'k' suffix"""
+    amount = amount.strip()
+    return '$' in amount or amount.endswith('k') or amount.endswith(('usd', 'dollar', 'dollars'))
 
 class TravelDataProcessor:
     def __init__(self):
@@ -8,6 +59,7 @@ class TravelDataProcessor:
         self.travel_packages = self.load_json("travel_packages.json")
         self.weather_data = self.load_json("weather_data.json")
         self.visa_data = self.load_json("visa_prices.json")
+        self.destination_aliases = self.build_destination_aliases()
 
     def load_json(self, filename):
         """Load JSON data from file"""
@@ -111,31 +163,147 @@ class TravelDataProcessor:
         
         return packages
 
-    def get_relevant_data(self, user_message):
-        """Get relevant data based on user message"""
+    def build_destination_aliases(self):
+        """Map lowercase city and country names to the names used in the datasets"""
+        aliases = {}
+        for package in self.travel_packages.get('packages', []):
+            for name in (package.get('destination'), package.get('country')):
+                if name:
+                    aliases[name.lower()] = name
+
+        for name in list(self.weather_data.get('weather_data', {})) + list(self.visa_data.get('visa_data', {})):
+            aliases[name.lower()] = name
+
+        return aliases
+
+    def parse_amount(self, amount):
+        """Parse budget amounts like '$2,500', '3k' or '1800 usd'"""
+        amount = re.sub(r'[^\d.k]', '', amount.lower())
+        if amount.endswith('k'):
+            return int(float(amount[:-1]) * 1000)
+        return int(float(amount))
+
+    def extract_budget(self, user_message):
+        """Extract a budget range, only trusting amounts that are clearly prices"""
+        between = re.search(r'(\b(?:budget|price|cost)s?\s+)?\b(?:between|from)\s+(' + AMOUNT + r')\s*(?:and|to|-)\s*(' + AMOUNT + ')',
+                            user_message)
+        if between and (between.group(1) or is_money(between.group(2)) or is_money(between.group(3))):
+            return {'min_budget': self.parse_amount(between.group(2)),
+                    'max_budget': self.parse_amount(between.group(3))}
+
+        if re.search(r'\b(?:any|no|flexible|whatever)\s+budget\b', user_message):
+            return {'min_budget': None, 'max_budget': None}
+
+        budget = {}
+        for match in re.finditer(r'\b(under|below|less than|up to|within|no more than|max(?:imum)?|'
+                                 r'over|above|more than|at least|min(?:imum)?|'
+                                 r'(?:budget|price|cost)s?(?:\s+(?:of|is|around|about|under|below|up to))?:?)\s*(' + AMOUNT + ')',
+                                 user_message):
+            qualifier, amount = match.group(1), match.group(2)
+            by_keyword = qualifier.startswith(('budget', 'price', 'cost'))
+            if not (by_keyword or is_money(amount)):
+                continue
+            if qualifier in ('over', 'above', 'more than', 'at least') or qualifier.startswith('min'):
+                budget.setdefault('min_budget', self.parse_amount(amount))
+            else:
+                budget.setdefault('max_budget', self.parse_amount(amount))
+
+        return budget
+
+    def extract_preferences(self, user_message):
+        """Extract destinations, budget, season, party size, categories and topics from a message"""
         user_message = user_message.lower()
-        relevant_data = {}
-        
-        # Determine what data to include based on keywords
-        if any(word in user_message for word in ['package', 'trip', 'travel', 'vacation', 'holiday']):
-            relevant_data['packages'] = self.travel_packages.get('packages', [])
-        
-        if any(word in user_message for word in ['weather', 'climate', 'temperature', 'rain']):
-            relevant_data['weather'] = self.weather_data.get('weather_data', {})
-        
-        if any(word in user_message for word in ['visa', 'passport', 'entry', 'requirements']):
-            relevant_data['visa'] = self.visa_data.get('visa_data', {})
-        
-        # Extract specific destinations mentioned
-        destinations = ['paris', 'tokyo', 'bali', 'france', 'japan', 'indonesia']
-        mentioned_destinations = [dest for dest in destinations if dest in user_message]
-        
-        if mentioned_destinations and not relevant_data:
+        preferences = {}
+
+        destinations = []
+        for alias, name in self.destination_aliases.items():
+            if contains_word(user_message, alias) and name not in destinations:
+                destinations.append(name)
+        if destinations:
+            preferences['destinations'] = destinations
+        elif re.search(SHOW_EVERYTHING, user_message) or re.search(ANY_DESTINATION, user_message):
+            preferences['destinations'] = []
+
+        known_categories = {p.get('category', '').lower() for p in self.travel_packages.get('packages', [])}
+        categories = [cat for cat in sorted(known_categories) if cat and contains_word(user_message, cat)]
+        categories += [cat for word, cat in CATEGORY_SYNONYMS.items()
+                       if contains_word(user_message, word) and cat not in categories]
+        if categories:
+            preferences['categories'] = categories
+        elif re.search(SHOW_EVERYTHING, user_message) or re.search(ANY_CATEGORY, user_message):
+            preferences['categories'] = []
+
+        preferences.update(self.extract_budget(user_message))
+
+        for word, season in SEASON_WORDS.items():
+            if ('season' in word and contains_word(user_message, word)
+                    or re.search(SEASON_BEFORE + word + r'\b', user_message)
+                    or re.search(r'\b' + word + SEASON_AFTER, user_message)):
+                preferences['season'] = season
+                break
+
+        number = r'(\d+|' + '|'.join(NUMBER_WORDS) + r')'
+        party = (re.search(r'\b(?:party|group|family) of\s+' + number + r'\b', user_message)
+                 or re.search(r'\b' + number + r'\s+(?:people|persons|adults|travell?ers|guests|of us)\b', user_message))
+        if party:
+            size = party.group(1)
+            preferences['party_size'] = int(size) if size.isdigit() else NUMBER_WORDS[size]
+        elif re.search(r'\b(?:solo|alone|just me)\b', user_message):
+            preferences['party_size'] = 1
+        elif re.search(r'\b(?:couple|honeymoon)\b(?!\s+of\b)', user_message):
+            preferences['party_size'] = 2
+
+        topics = [topic for topic, words in TOPIC_KEYWORDS.items()
+                  if any(contains_word(user_message, word) for word in words)]
+        if not topics and destinations:
             # If destinations are mentioned but no specific data type, include all
-            relevant_data = {
-                'packages': self.travel_packages.get('packages', []),
-                'weather': self.weather_data.get('weather_data', {}),
-                'visa': self.visa_data.get('visa_data', {})
-            }
-        
+            topics = list(TOPIC_KEYWORDS)
+        if topics:
+            preferences['topics'] = topics
+
+        return preferences
+
+    def get_relevant_data(self, user_message, profile=None):
+        """Get relevant data for a message, or for a session profile already updated with it
+
+        The profile is only read here; callers merge each message into it
+        with profile.update(extract_preferences(message)) first.
+        """
+        if profile is None:
+            profile = UserProfile()
+            profile.update(self.extract_preferences(user_message))
+
+        places = set(profile.destinations)
+        for package in self.travel_packages.get('packages', []):
+            if package.get('destination') in places or package.get('country') in places:
+                places.update([package.get('destination'), package.get('country')])
+
+        relevant_data = {}
+
+        if 'packages' in profile.topics:
+            # Each filter only narrows the list if something still matches,
+            # so preferences from earlier turns never leave the turn empty
+            filters = [
+                lambda p: not profile.destinations or p.get('destination') in places or p.get('country') in places,
+                lambda p: not profile.categories or p.get('category', '').lower() in profile.categories,
+                lambda p: profile.min_budget is None or p.get('price', 0) >= profile.min_budget,
+                lambda p: profile.max_budget is None or p.get('price', 0) <= profile.max_budget
+            ]
+            packages = self.travel_packages.get('packages', [])
+            for matches in filters:
+                narrowed = [p for p in packages if matches(p)]
+                if narrowed:
+                    packages = narrowed
+            relevant_data['packages'] = packages
+
+        if 'weather' in profile.topics:
+            weather = self.weather_data.get('weather_data', {})
+            scoped = {name: info for name, info in weather.items() if name in places}
+            relevant_data['weather'] = scoped or weather
+
+        if 'visa' in profile.topics:
+            visa = self.visa_data.get('visa_data', {})
+            scoped = {country: info for country, info in visa.items() if country in places}
+            relevant_data['visa'] = scoped or visa
+
         return relevant_data
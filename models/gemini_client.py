@@ -31,19 +31,20 @@ class GeminiTravelAssistant:
         try:
             genai.configure(api_key=Config.GEMINI_API_KEY)
             self.model = genai.GenerativeModel('gemini-2.0-flash')
-            self.chat_session = None
-            self.initialize_chat()
             print("✅ Gemini model initialized successfully")
         except Exception as e:
             print(f"❌ Error initializing Gemini: {e}")
             # We'll use fallback responses if Gemini fails
             self.model = None
-            self.chat_session = None
     
-    def initialize_chat(self):
-        """Initialize chat with human-like travel expert persona"""
+    def start_chat_session(self):
+        """Start a new chat with the human-like travel expert persona
+        
+        Each user session gets its own chat so histories never mix.
+        Returns None if Gemini is unavailable.
+        """
         if not self.model:
-            return
+            return None
             
         system_prompt = """
         You are Emma, a friendly and experienced human travel consultant who has been helping people plan amazing trips for over 10 years. 
@@ -62,38 +63,48 @@ class GeminiTravelAssistant:
         """
         
         try:
-            self.chat_session = self.model.start_chat(history=[])
-            self.chat_session.send_message(system_prompt)
-            print("✅ Chat session initialized")
+            chat_session = self.model.start_chat(history=[])
+            chat_session.send_message(system_prompt)
+            return chat_session
         except Exception as e:
             print(f"❌ Error initializing chat: {e}")
-            self.chat_session = None
+            return None
     
-    def get_response(self, user_message, travel_data=None):
-        """Get human-like response using Gemini or fallback to dataset-based responses"""
+    def get_response(self, user_message, travel_data=None, full_data=None, on_delivered=None, chat_session=None):
+        """Get human-like response using Gemini or fallback to dataset-based responses
+        
+        chat_session is the user's own chat from start_chat_session(). travel_data
+        may be a delta against that chat's history; the dataset fallback has no
+        history, so it uses full_data when given. on_delivered is called only
+        after Gemini has replied, i.e. once travel_data is in the chat history.
+        """
+        fallback_data = full_data if full_data is not None else travel_data
         
         # If Gemini is available, use it
-        if self.model and self.chat_session:
+        if self.model and chat_session:
             try:
-                return self.get_gemini_response(user_message, travel_data)
+                response = self.get_gemini_response(user_message, travel_data, chat_session)
+                if on_delivered:
+                    on_delivered()
+                return response
             except Exception as e:
                 print(f"Gemini failed, using fallback: {e}")
-                return self.get_dataset_response(user_message, travel_data)
+                return self.get_dataset_response(user_message, fallback_data)
         
         # Use dataset-based responses
-        return self.get_dataset_response(user_message, travel_data)
+        return self.get_dataset_response(user_message, fallback_data)
     
-    def get_gemini_response(self, user_message, travel_data):
+    def get_gemini_response(self, user_message, travel_data, chat_session):
         """Get response from Gemini with dataset context"""
         context = f"""
         User's question: {user_message}
         
-        Available travel data: {json.dumps(travel_data, indent=2) if travel_data else "No specific data available"}
+        New travel data: {json.dumps(travel_data, indent=2) if travel_data else "No new data available"}
         
-        Respond as Emma, a friendly human travel consultant. Use the travel data to give specific recommendations with exact prices and details. Be conversational and natural, like talking to a friend.
+        Respond as Emma, a friendly human travel consultant. The data above only includes records not shared earlier in this conversation, plus the traveler's profile so far - keep using the packages, weather and visa details from earlier messages too. Use the travel data to give specific recommendations with exact prices and details. Be conversational and natural, like talking to a friend.
         """
         
-        response = self.chat_session.send_message(context)
+        response = chat_session.send_message(context)
         return response.text
     
     def get_dataset_response(self, user_message, travel_data):
@@ -150,7 +161,7 @@ Are you planning more of a relaxing beach vacation or an adventure-packed trip?
     
     def handle_package_query(self, user_msg, travel_data):
         """Handle travel package queries"""
-        if travel_data and 'packages' in travel_data:
+        if travel_data and travel_data.get('packages'):
             packages = travel_data['packages']
             
             # Filter based on user preferences
@@ -298,15 +309,6 @@ Once I know that, I can give you the exact requirements, costs, and processing t
         import random
         return random.choice(greetings)
     
-    def reset_chat(self):
-        """Reset chat session"""
-        if self.model:
-            try:
-                self.initialize_chat()
-                print("✅ Chat reset successfully")
-            except:
-                pass
-    
     def get_welcome_message(self):
         """Get welcome message after reset"""
         return "Hello! I'm Emma, your travel consultant! I've refreshed our conversation and I'm ready to help you plan an amazing trip! What destination is inspiring you today? ✈️🌍"
@@ -0,0 +1,106 @@
+import hashlib
+import json
+
+
+class UserProfile:
+    """Per-session traveler profile accumulated across chat turns"""
+
+    def __init__(self):
+        self.user_country = 'US'
+        self.destinations = []
+        self.categories = []
+        self.min_budget = None
+        self.max_budget = None
+        self.season = None
+        self.party_size = None
+        self.topics = []
+        self.shown_package_ids = []
+        self.sent_records = {}
+        self.chat_session = None
+
+    def update(self, preferences):
+        """Merge preferences extracted from the latest message"""
+        # Anything mentioned explicitly replaces the earlier value so the
+        # traveler can change their mind mid-conversation
+        # An empty list means the traveler asked for "anywhere" / "any kind"
+        if 'destinations' in preferences:
+            self.destinations = list(preferences['destinations'])
+
+        if 'categories' in preferences:
+            self.categories = list(preferences['categories'])
+
+        if 'min_budget' in preferences or 'max_budget' in preferences:
+            self.min_budget = preferences.get('min_budget')
+            self.max_budget = preferences.get('max_budget')
+
+        if preferences.get('season'):
+            self.season = preferences['season']
+
+        if preferences.get('party_size'):
+            self.party_size = preferences['party_size']
+
+        # Follow-up turns without topic keywords keep the previous topics
+        if preferences.get('topics'):
+            self.topics = list(preferences['topics'])
+
+    def get_context_delta(self, relevant_data):
+        """Return the records not yet sent in this session (or changed since)
+        
+        Returns (delta, pending). Nothing is recorded as sent until
+        mark_sent(pending) is called once the model has actually seen them.
+        """
+        delta = {}
+        pending = {}
+
+        packages = []
+        for pkg in relevant_data.get('packages', []):
+            if self._is_new(('package', pkg.get('id')), pkg, pending):
+                packages.append(pkg)
+        if packages:
+            delta['packages'] = packages
+
+        for section in ('weather', 'visa'):
+            records = {name: record for name, record in relevant_data.get(section, {}).items()
+                       if self._is_new((section, name), record, pending)}
+            if records:
+                delta[section] = records
+
+        return delta, pending
+
+    def mark_sent(self, pending):
+        """Record the fingerprints returned by get_context_delta as sent"""
+        self.sent_records.update(pending)
+        for record_type, name in pending:
+            if record_type == 'package' and name not in self.shown_package_ids:
+                self.shown_package_ids.append(name)
+
+    def _is_new(self, key, record, pending):
+        """Whether record is new or changed since it was last sent"""
+        fingerprint = hashlib.sha1(
+            json.dumps(record, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+        if self.sent_records.get(key) == fingerprint:
+            return False
+
+        pending[key] = fingerprint
+        return True
+
+    def summary(self):
+        """Compact description of the profile for the model prompt"""
+        summary = {'user_country': self.user_country}
+
+        if self.destinations:
+            summary['destinations'] = self.destinations
+        if self.categories:
+            summary['categories'] = self.categories
+        if self.min_budget is not None or self.max_budget is not None:
+            summary['budget'] = {'min': self.min_budget, 'max': self.max_budget}
+        if self.season:
+            summary['season'] = self.season
+        if self.party_size:
+            summary['party_size'] = self.party_size
+        if self.shown_package_ids:
+            summary['shown_package_ids'] = self.shown_package_ids
+
+        return summary
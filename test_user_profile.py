@@ -0,0 +1,144 @@
+# test_user_profile.py
+import unittest
+
+from models.data_processor import TravelDataProcessor
+from models.user_profile import UserProfile
+
+PACKAGES = [
+    {"id": 1, "destination": "Paris", "country": "France", "category": "romantic", "price": 2500},
+    {"id": 2, "destination": "Tokyo", "country": "Japan", "category": "cultural", "price": 3200},
+    {"id": 3, "destination": "Bali", "country": "Indonesia", "category": "adventure", "price": 1800}
+]
+
+
+def make_processor():
+    processor = TravelDataProcessor()
+    processor.travel_packages = {"packages": [dict(pkg) for pkg in PACKAGES]}
+    processor.weather_data = {"weather_data": {"Paris": {"spring": {"avg_temp": "15°C"}},
+                                               "Tokyo": {"spring": {"avg_temp": "18°C"}}}}
+    processor.visa_data = {"visa_data": {"France": {"tourist_visa": {"US": {"required": False}}}}}
+    processor.destination_aliases = processor.build_destination_aliases()
+    return processor
+
+
+def package_ids(relevant_data):
+    return [pkg["id"] for pkg in relevant_data.get("packages", [])]
+
+
+class ExtractPreferencesTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = make_processor()
+
+    def test_budget_needs_a_price_marker(self):
+        extract = self.processor.extract_preferences
+        self.assertEqual(extract("under $3,000")["max_budget"], 3000)
+        self.assertEqual(extract("budget of 2500")["max_budget"], 2500)
+        self.assertEqual(extract("at least 2k")["min_budget"], 2000)
+        between = extract("somewhere between $1,500 and 3000")
+        self.assertEqual((between["min_budget"], between["max_budget"]), (1500, 3000))
+
+    def test_budget_at_the_end_of_a_sentence(self):
+        extract = self.processor.extract_preferences
+        self.assertEqual(extract("I want a trip under $3,000.")["max_budget"], 3000)
+        self.assertEqual(extract("budget is 2000.")["max_budget"], 2000)
+        between = extract("between $1,500 and $3,000.")
+        self.assertEqual((between["min_budget"], between["max_budget"]), (1500, 3000))
+
+    def test_durations_and_head_counts_are_not_budgets(self):
+        for message in ["any trip within 10 days", "packages up to 3 people",
+                        "trip for at least 2 weeks", "trip from 5 to 10 days"]:
+            preferences = self.processor.extract_preferences(message)
+            self.assertNotIn("min_budget", preferences, message)
+            self.assertNotIn("max_budget", preferences, message)
+
+    def test_party_size(self):
+        extract = self.processor.extract_preferences
+        self.assertEqual(extract("family of four")["party_size"], 4)
+        self.assertEqual(extract("3 adults")["party_size"], 3)
+        self.assertEqual(extract("honeymoon ideas")["party_size"], 2)
+        self.assertNotIn("party_size", extract("a couple of days in paris"))
+
+    def test_season(self):
+        extract = self.processor.extract_preferences
+        self.assertEqual(extract("paris in autumn")["season"], "fall")
+        self.assertEqual(extract("bali in the dry season")["season"], "dry_season")
+        self.assertEqual(extract("planning a summer trip")["season"], "summer")
+        self.assertNotIn("season", extract("I always fall asleep on planes"))
+        self.assertNotIn("season", extract("I love spring rolls"))
+
+    def test_words_match_on_boundaries(self):
+        preferences = self.processor.extract_preferences("take the train to a parisian cafe")
+        self.assertEqual(preferences, {})
+
+
+class RelevantDataTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = make_processor()
+        self.profile = UserProfile()
+
+    def ask(self, message):
+        self.profile.update(self.processor.extract_preferences(message))
+        return self.processor.get_relevant_data(message, self.profile)
+
+    def test_follow_up_reuses_topics_and_filters(self):
+        self.ask("romantic trip to paris")
+        self.assertEqual(package_ids(self.ask("what about the cheaper one?")), [1])
+
+    def test_new_destination_replaces_old_filters(self):
+        self.ask("romantic trip to paris")
+        self.assertEqual(package_ids(self.ask("what about tokyo package")), [2])
+
+    def test_leftover_budget_never_empties_the_result(self):
+        self.ask("trips under $1,000")
+        self.assertEqual(package_ids(self.ask("show me packages")), [1, 2, 3])
+
+    def test_budget_can_be_cleared(self):
+        self.ask("trips under $2,000")
+        self.ask("actually any budget is fine")
+        self.assertIsNone(self.profile.max_budget)
+
+    def test_destination_and_category_can_be_cleared(self):
+        self.ask("romantic trip to paris")
+        self.assertEqual(package_ids(self.ask("ok, show me all packages")), [1, 2, 3])
+        self.assertEqual((self.profile.destinations, self.profile.categories), ([], []))
+        self.ask("romantic trip to paris")
+        self.ask("anywhere is fine")
+        self.assertEqual((self.profile.destinations, self.profile.categories), ([], ["romantic"]))
+
+    def test_get_relevant_data_does_not_change_the_profile(self):
+        self.processor.get_relevant_data("romantic trip to paris", self.profile)
+        self.assertEqual(self.profile.summary(), UserProfile().summary())
+
+
+class ContextDeltaTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = make_processor()
+        self.profile = UserProfile()
+
+    def send(self, message):
+        self.profile.update(self.processor.extract_preferences(message))
+        relevant_data = self.processor.get_relevant_data(message, self.profile)
+        delta, pending = self.profile.get_context_delta(relevant_data)
+        self.profile.mark_sent(pending)
+        return delta
+
+    def test_only_new_records_are_sent(self):
+        self.assertEqual(package_ids(self.send("show me trips")), [1, 2, 3])
+        self.assertEqual(self.send("what about the cheaper one?"), {})
+        self.assertEqual(self.profile.shown_package_ids, [1, 2, 3])
+
+    def test_changed_records_are_resent(self):
+        self.send("show me trips")
+        self.processor.travel_packages["packages"][2]["price"] = 1500
+        self.assertEqual(package_ids(self.send("show me trips")), [3])
+
+    def test_records_are_not_sent_until_marked(self):
+        self.profile.update(self.processor.extract_preferences("show me trips"))
+        relevant_data = self.processor.get_relevant_data("show me trips", self.profile)
+        self.profile.get_context_delta(relevant_data)
+        delta, _ = self.profile.get_context_delta(relevant_data)
+        self.assertEqual(package_ids(delta), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()